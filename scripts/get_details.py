@@ -1,37 +1,48 @@
 from services.client import StorageScholarsClient
+from services.cache import ResponseCache
 import os
-from dotenv import load_dotenv
 import logging
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 import csv
 import time
-from alive_progress import alive_bar
+import tempfile
+import shutil
+from datetime import datetime
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 LOG_LEVEL = logging.INFO
 ORDER_IDS_FILE_NAME = "data\\order_ids_8-21-25.csv"
-REQUEST_DELAY = 0.3
-DELAY_MIN_REQUESTS = 50
+CACHE_FILE_NAME = "data\\response_cache.json"
+MAX_WORKERS = 16
+REPLACE_RETRY_DELAYS = (0, 0.5, 1, 2, 4)
 
 logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(name=__name__)
 
 def get_client() -> StorageScholarsClient:
+    from dotenv import load_dotenv
+
     load_dotenv()
     api_key: str | None = os.getenv(key="SS_API_KEY")
     if api_key is None:
         raise Exception("Missing api key")
     return StorageScholarsClient(api_key=api_key)
 
-def get_rows_and_fieldnames(file_name: str) -> tuple[list[dict], list[str]]:
+def get_rows_and_fieldnames(file_name: str) -> tuple[Iterator[dict], list[str]]:
     with open(file_name, newline='', encoding='utf-8') as csvfile:
         reader = csv.DictReader(csvfile)
-        rows = list(reader)
         fieldnames = list(reader.fieldnames) if reader.fieldnames else []
-    
-    if not rows or not fieldnames:
+        has_rows = next(reader, None) is not None
+
+    if not has_rows or not fieldnames:
         raise Exception("No data or headers found in input CSV.")
-    
-    return rows, fieldnames
+
+    def iter_rows() -> Iterator[dict]:
+        with open(file_name, newline='', encoding='utf-8') as csvfile:
+            yield from csv.DictReader(csvfile)
+
+    return iter_rows(), fieldnames
 
 def get_order_id(row: dict) -> int:
     order_id_str = row.get("OrderID") or row.get(next(iter(row)))
@@ -40,42 +51,101 @@ def get_order_id(row: dict) -> int:
     else:
         raise ValueError(f"Row does not have an order ID")
 
-def fetch_item_description(client: StorageScholarsClient, order_id: int) -> str:
-    items: list[dict[str, Any]] = client.get_request(url=f"/order/items/{order_id}")
+def fetch_item_description(client: StorageScholarsClient, cache: ResponseCache, order_id: int) -> str:
+    items: list[dict[str, Any]] = cache.get_or_fetch(
+        key=f"items:{order_id}",
+        fetcher=lambda: client.get_request(url=f"/order/items/{order_id}"),
+    )
     if items:
-        return ", ".join([f"{item['Quantity']}x {item['ItemTitle']}" for item in items])
+        return ", ".join(f"{item['Quantity']}x {item['ItemTitle']}" for item in items)
     return ""
 
-def write_to_csv(file_name: str, rows: list[dict], fieldnames: list[str]) -> None:
-    if 'items' not in fieldnames:
-        fieldnames.append('items')
-    
-    with open(file_name, mode="w", newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+def fetch_order_items(client: StorageScholarsClient, cache: ResponseCache, order_id: int) -> str:
+    try:
+        item_description = fetch_item_description(client=client, cache=cache, order_id=order_id)
+    except Exception as error_message:
+        logger.warning(f"Failed to get items for order {order_id}: {error_message}")
+        item_description = ""
+    return item_description
+
+def iter_updated_rows(client: StorageScholarsClient, cache: ResponseCache, rows: Iterable[dict], progress: Callable[[], Any]) -> Iterator[dict]:
+    pending: deque[tuple[dict, Future[str]]] = deque()
+    futures_by_id: dict[int, Future[str]] = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for row in rows:
+            order_id = get_order_id(row)
+            if order_id not in futures_by_id:
+                futures_by_id[order_id] = executor.submit(fetch_order_items, client, cache, order_id)
+            pending.append((row, futures_by_id[order_id]))
+            if len(pending) < MAX_WORKERS * 2:
+                continue
+            done_row, future = pending.popleft()
+            done_row['Items'] = future.result()
+            progress()
+            yield done_row
+
+        while pending:
+            done_row, future = pending.popleft()
+            done_row['Items'] = future.result()
+            progress()
+            yield done_row
+
+def add_suffix_to_file_name(file_name: str, suffix: str) -> str:
+    root, ext = os.path.splitext(file_name)
+    return f"{root}{suffix}{ext}"
+
+def replace_file(source: str, file_name: str) -> str:
+    for delay in REPLACE_RETRY_DELAYS:
+        time.sleep(delay)
+        try:
+            os.replace(source, file_name)
+            return file_name
+        except PermissionError:
+            logger.warning(f"{file_name} is in use, retrying")
+
+    fallback_file_name = add_suffix_to_file_name(file_name, datetime.now().strftime(" (%Y-%m-%d %H-%M-%S)"))
+    os.replace(source, fallback_file_name)
+    return fallback_file_name
+
+def write_to_csv(file_name: str, rows: Iterable[dict], fieldnames: list[str]) -> tuple[int, str]:
+    if 'Items' not in fieldnames:
+        fieldnames.append('Items')
+
+    row_count = 0
+    tmp = tempfile.NamedTemporaryFile(mode="w", dir=os.path.dirname(file_name) or '.', delete=False, newline='', encoding='utf-8')
+    try:
+        with tmp:
+            writer = csv.DictWriter(tmp, fieldnames=fieldnames)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                row_count += 1
+
+        if os.path.exists(file_name):
+            shutil.copymode(file_name, tmp.name)
+        written_file_name = replace_file(tmp.name, file_name)
+    except BaseException:
+        os.remove(tmp.name)
+        raise
+    return row_count, written_file_name
 
 def main() -> None:
+    from alive_progress import alive_bar
+
     logger.info(msg="Starting...")
     try:
         client: StorageScholarsClient = get_client()
+        cache = ResponseCache(file_name=CACHE_FILE_NAME)
         rows, fieldnames = get_rows_and_fieldnames(ORDER_IDS_FILE_NAME)
-        logger.info(msg=f"Getting items for {len(rows)} order(s)")
+        logger.info(msg=f"Getting items for orders in {ORDER_IDS_FILE_NAME}")
 
-        with alive_bar(len(rows), title="Fetching orders") as bar:
-            for row in rows:
-                order_id = get_order_id(row)
-                try:
-                    item_description = fetch_item_description(client=client, order_id=order_id)
-                except Exception as error_message:
-                    logger.warning(f"Failed to get items for order {order_id}: {error_message}")
-                    item_description = ""
-                row['Items'] = item_description
-                bar()
-                time.sleep(REQUEST_DELAY if len(rows) >= DELAY_MIN_REQUESTS else 0)
-
-        write_to_csv(ORDER_IDS_FILE_NAME, rows, fieldnames)
-        logger.info(msg=f"Updated items of {len(rows)} order(s) in {ORDER_IDS_FILE_NAME}.")
+        try:
+            with alive_bar(title="Fetching orders") as bar:
+                updated_rows = iter_updated_rows(client=client, cache=cache, rows=rows, progress=bar)
+                row_count, written_file_name = write_to_csv(ORDER_IDS_FILE_NAME, updated_rows, fieldnames)
+        finally:
+            cache.save()
+        logger.info(msg=f"Updated items of {row_count} order(s) in {written_file_name}.")
     except Exception as error_message:
         logger.exception(msg=error_message)
     logger.info(msg="Finished")
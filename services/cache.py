@@ -0,0 +1,88 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(name=__name__)
+
+class ResponseCache:
+    def __init__(self, file_name: str, expire_seconds: int = 86400) -> None:
+        """Initialize the cache, loading any entries persisted by a previous run
+
+        Args:
+            file_name (str): JSON file the cache is persisted to
+            expire_seconds (int, optional): Age after which an entry is refetched. Defaults to 86400.
+        """
+
+        self.file_name: str = file_name
+        self.expire_seconds: int = expire_seconds
+        self.lock: threading.Lock = threading.Lock()
+        self.entries: dict[str, dict[str, Any]] = {}
+        if os.path.exists(file_name):
+            try:
+                with open(file_name, encoding='utf-8') as cache_file:
+                    entries = json.load(cache_file)
+            except (OSError, ValueError) as error_message:
+                logger.warning(f"Ignoring unreadable cache {file_name}: {error_message}")
+            else:
+                if isinstance(entries, dict):
+                    self.entries = entries
+                else:
+                    logger.warning(f"Ignoring cache {file_name}: expected a JSON object")
+
+    def get_or_fetch(self, key: str, fetcher: Callable[[], Any]) -> Any:
+        """Returns the cached value for a key, calling the fetcher on a miss or expired entry
+
+        Args:
+            key (str): Cache key, e.g. "items:{order_id}"
+            fetcher (Callable[[], Any]): Produces a JSON serializable value on a miss
+
+        Returns:
+            Any: Cached or freshly fetched value
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+        if self.is_fresh(entry):
+            return entry["value"]
+
+        value = fetcher()
+        with self.lock:
+            self.entries[key] = {"stored_at": time.time(), "value": value}
+        return value
+
+    def is_fresh(self, entry: Any) -> bool:
+        """Checks that an entry is well formed and younger than expire_seconds
+
+        Args:
+            entry (Any): Stored entry, None on a miss
+
+        Returns:
+            bool: True if the entry can be served
+        """
+        if not isinstance(entry, dict) or "value" not in entry:
+            return False
+        stored_at = entry.get("stored_at")
+        if not isinstance(stored_at, (int, float)):
+            return False
+        return time.time() - stored_at < self.expire_seconds
+
+    def save(self) -> None:
+        """Writes the unexpired cache entries to disk, replacing the file atomically"""
+        with self.lock:
+            self.entries = {key: entry for key, entry in self.entries.items() if self.is_fresh(entry)}
+            entries = dict(self.entries)
+        directory = os.path.dirname(self.file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp = tempfile.NamedTemporaryFile(mode="w", dir=directory or '.', delete=False, encoding='utf-8')
+        try:
+            with tmp:
+                json.dump(entries, tmp)
+            os.replace(tmp.name, self.file_name)
+        except BaseException:
+            os.remove(tmp.name)
+            raise
@@ -1,11 +1,26 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Any
 import logging
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import orjson
+from services.rate_limiter import RateLimiter
 
 LOG_LEVEL = logging.INFO
+MAX_REQUESTS_PER_SECOND = 20
+POOL_SIZE = 32
+DEFAULT_RETRY_AFTER = 1.0
+MAX_RETRY_AFTER = 60.0
 
 logger = logging.getLogger(name=__name__)
 
+class GatewayRetry(Retry):
+    """Retry that honors Retry-After on 413 and 503 but leaves 429 to StorageScholarsClient.get_request"""
+
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
+
 class StorageScholarsClient:
     def __init__(self, api_key: str) -> None:
         """Initialize the client
@@ -16,16 +31,22 @@ class StorageScholarsClient:
 
         self.BASE_URL: str = "https://api.storagescholars.com"
         self.TIMEOUT_DURATION: int = 10
+        self.rate_limiter: RateLimiter = RateLimiter(max_rate=MAX_REQUESTS_PER_SECOND)
         self.session: requests.Session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {api_key}',
             'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
             'Referer': 'https://signup.storagescholars.com/',
             'sec-ch-ua': '"Not;A=Brand";v="99", "Brave";v="139", "Chromium";v="139"',
             'sec-ch-ua-platform': '"Windows"',
             'sec-ch-ua-mobile': '?0',
         })
+        retry: Retry = GatewayRetry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def get_request(self, url: str, params: dict[str, Any] = {}) -> list[dict[str, Any]]:
         """Sends a get request with the client
@@ -39,10 +60,41 @@ class StorageScholarsClient:
         """
         try:
             url = f"{self.BASE_URL}{url}"
+            self.rate_limiter.acquire()
             response: requests.Response = self.session.get(url=url, params=params, timeout=self.TIMEOUT_DURATION)
+            if response.status_code == 429:
+                retry_after = self.get_retry_after(response)
+                logger.warning(f"Rate limited, retrying in {retry_after}s")
+                self.rate_limiter.pause(retry_after)
+                self.rate_limiter.acquire()
+                response = self.session.get(url=url, params=params, timeout=self.TIMEOUT_DURATION)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.RequestException as error_message:
             raise Exception(f"Get request failed: {error_message}")
         except Exception as error_message:
             raise Exception(f"Unexpected error: {error_message}")
+
+    @staticmethod
+    def get_retry_after(response: requests.Response) -> float:
+        """Reads the Retry-After header of a response
+
+        Args:
+            response (requests.Response): Response with a 429 status
+
+        Returns:
+            float: Seconds to wait before retrying, capped at MAX_RETRY_AFTER. DEFAULT_RETRY_AFTER if the header is missing or invalid.
+        """
+        retry_after: str | None = response.headers.get('Retry-After')
+        if not retry_after:
+            return DEFAULT_RETRY_AFTER
+        if retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        try:
+            retry_at: datetime = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return min(max(seconds, 0.0), MAX_RETRY_AFTER)
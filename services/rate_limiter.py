@@ -0,0 +1,51 @@
+import threading
+import time
+
+class RateLimiter:
+    def __init__(self, max_rate: float, time_period: float = 1.0) -> None:
+        """Initialize a thread-safe token bucket
+
+        Args:
+            max_rate (float): Number of calls allowed per time period, also the burst size
+            time_period (float, optional): Length of the period in seconds. Defaults to 1.0.
+        """
+
+        self.max_rate: float = max_rate
+        self.time_period: float = time_period
+        self.tokens: float = max_rate
+        self.updated_at: float = time.monotonic()
+        self.lock: threading.Lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a call is allowed by the bucket and any active pause has ended"""
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.tokens -= 1
+            wait = self.updated_at - now + max(-self.tokens, 0) * self.time_period / self.max_rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Holds back every caller for the given number of seconds, e.g. after a 429
+
+        Args:
+            seconds (float): How long to pause for
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            self.tokens = min(self.tokens, 0)
+            self.updated_at = max(self.updated_at, now + seconds)
+
+    def refill(self, now: float) -> None:
+        """Adds the tokens earned since the last update. Nothing is earned until a pause has ended.
+
+        Args:
+            now (float): Current time.monotonic() value
+        """
+        if now <= self.updated_at:
+            return
+        refill = (now - self.updated_at) * self.max_rate / self.time_period
+        self.tokens = min(self.max_rate, self.tokens + refill)
+        self.updated_at = now
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from services.cache import ResponseCache
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "cache.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_cache(self, content: str) -> None:
+        with open(self.file_name, mode="w", encoding='utf-8') as cache_file:
+            cache_file.write(content)
+
+    def test_hit_skips_fetcher(self) -> None:
+        cache = ResponseCache(file_name=self.file_name)
+        self.assertEqual(cache.get_or_fetch("items:1", lambda: [1]), [1])
+        self.assertEqual(cache.get_or_fetch("items:1", lambda: [2]), [1])
+
+    def test_expired_entry_is_refetched(self) -> None:
+        self.write_cache(json.dumps({"items:1": {"stored_at": time.time() - 120, "value": "old"}}))
+        cache = ResponseCache(file_name=self.file_name, expire_seconds=60)
+        self.assertEqual(cache.get_or_fetch("items:1", lambda: "new"), "new")
+
+    def test_malformed_file_is_ignored(self) -> None:
+        self.write_cache('{"items:1": ')
+        with self.assertLogs("services.cache", level="WARNING"):
+            cache = ResponseCache(file_name=self.file_name)
+        self.assertEqual(cache.get_or_fetch("items:1", lambda: "fetched"), "fetched")
+
+    def test_non_dict_file_is_ignored(self) -> None:
+        self.write_cache("[1, 2]")
+        with self.assertLogs("services.cache", level="WARNING"):
+            cache = ResponseCache(file_name=self.file_name)
+        self.assertEqual(cache.get_or_fetch("items:1", lambda: "fetched"), "fetched")
+
+    def test_save_persists_and_prunes(self) -> None:
+        self.write_cache(json.dumps({
+            "stale": {"stored_at": time.time() - 120, "value": 1},
+            "broken": 3,
+            "fresh": {"stored_at": time.time(), "value": 2},
+        }))
+        cache = ResponseCache(file_name=self.file_name, expire_seconds=60)
+        cache.get_or_fetch("added", lambda: 4)
+        cache.save()
+
+        with open(self.file_name, encoding='utf-8') as cache_file:
+            saved = json.load(cache_file)
+        self.assertEqual(sorted(saved), ["added", "fresh"])
+        self.assertEqual(os.listdir(self.directory.name), ["cache.json"])
+        self.assertEqual(ResponseCache(file_name=self.file_name).get_or_fetch("fresh", lambda: None), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import requests
+
+from services.client import DEFAULT_RETRY_AFTER, MAX_RETRY_AFTER, GatewayRetry, StorageScholarsClient
+
+def make_response(retry_after: str | None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+class GetRetryAfterTest(unittest.TestCase):
+    def test_seconds(self) -> None:
+        self.assertEqual(StorageScholarsClient.get_retry_after(make_response("3")), 3.0)
+
+    def test_missing_or_invalid(self) -> None:
+        self.assertEqual(StorageScholarsClient.get_retry_after(make_response(None)), DEFAULT_RETRY_AFTER)
+        self.assertEqual(StorageScholarsClient.get_retry_after(make_response("soon")), DEFAULT_RETRY_AFTER)
+
+    def test_naive_http_date(self) -> None:
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        header = format_datetime(retry_at.replace(tzinfo=None))
+        self.assertTrue(header.endswith("-0000"))
+        self.assertAlmostEqual(StorageScholarsClient.get_retry_after(make_response(header)), 30, delta=2)
+
+    def test_capped(self) -> None:
+        self.assertEqual(StorageScholarsClient.get_retry_after(make_response("3600")), MAX_RETRY_AFTER)
+
+class GatewayRetryTest(unittest.TestCase):
+    def test_retry_after_statuses(self) -> None:
+        retry = StorageScholarsClient(api_key="key").session.get_adapter("https://").max_retries
+        self.assertIsInstance(retry, GatewayRetry)
+        self.assertTrue(retry.respect_retry_after_header)
+        self.assertFalse(retry.is_retry("GET", 429, has_retry_after=True))
+        self.assertTrue(retry.is_retry("GET", 503, has_retry_after=True))
+        self.assertIsInstance(retry.increment("GET", "/x"), GatewayRetry)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import csv
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from typing import Any
+from unittest import mock
+
+from services.cache import ResponseCache
+from scripts import get_details
+
+class StubClient:
+    def __init__(self, failing_order_id: int) -> None:
+        self.failing_order_id: int = failing_order_id
+        self.calls: Counter[str] = Counter()
+        self.lock: threading.Lock = threading.Lock()
+
+    def get_request(self, url: str, params: dict[str, Any] = {}) -> list[dict[str, Any]]:
+        with self.lock:
+            self.calls[url] += 1
+        order_id = int(url.rsplit("/", 1)[1])
+        if order_id == self.failing_order_id:
+            raise Exception("Get request failed: 500")
+        return [{"Quantity": 2, "ItemTitle": f"Box {order_id}"}, {"Quantity": 1, "ItemTitle": "Lamp"}]
+
+class IterUpdatedRowsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(file_name=os.path.join(self.directory.name, "cache.json"))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_order_dedup_and_failures(self) -> None:
+        client = StubClient(failing_order_id=3)
+        rows = [{"OrderID": str(index % 10 + 1), "Name": f"row {index}"} for index in range(get_details.MAX_WORKERS * 5)]
+        progress_calls: list[None] = []
+
+        with self.assertLogs(get_details.logger, level="WARNING"):
+            updated_rows = list(get_details.iter_updated_rows(
+                client=client, cache=self.cache, rows=iter(rows), progress=lambda: progress_calls.append(None),
+            ))
+
+        self.assertEqual([row["Name"] for row in updated_rows], [f"row {index}" for index in range(len(rows))])
+        self.assertEqual(len(progress_calls), len(rows))
+        self.assertEqual(client.calls, Counter({f"/order/items/{order_id}": 1 for order_id in range(1, 11)}))
+        for row in updated_rows:
+            if row["OrderID"] == "3":
+                self.assertEqual(row["Items"], "")
+            else:
+                self.assertEqual(row["Items"], f"2x Box {row['OrderID']}, 1x Lamp")
+
+class WriteToCsvTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "orders.csv")
+        with open(self.file_name, mode="w", newline='', encoding='utf-8') as csvfile:
+            csvfile.write("OrderID\n1\n")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    @unittest.skipIf(os.name == 'nt', "POSIX permission bits")
+    def test_keeps_file_mode(self) -> None:
+        os.chmod(self.file_name, 0o644)
+        row_count, written_file_name = get_details.write_to_csv(self.file_name, [{"OrderID": "1", "Items": "1x Box"}], ["OrderID"])
+
+        self.assertEqual((row_count, written_file_name), (1, self.file_name))
+        self.assertEqual(stat.S_IMODE(os.stat(self.file_name).st_mode), 0o644)
+        with open(self.file_name, newline='', encoding='utf-8') as csvfile:
+            self.assertEqual(list(csv.DictReader(csvfile)), [{"OrderID": "1", "Items": "1x Box"}])
+
+class ReplaceFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_locked_target_falls_back_to_timestamped_name(self) -> None:
+        file_name = os.path.join(self.directory.name, "orders.2025.csv")
+        source = os.path.join(self.directory.name, "tmp_output")
+        with open(source, mode="w", encoding='utf-8') as source_file:
+            source_file.write("OrderID\n")
+
+        real_replace = os.replace
+
+        def locked_replace(src: str, dst: str) -> None:
+            if dst == file_name:
+                raise PermissionError(dst)
+            real_replace(src, dst)
+
+        with mock.patch.object(get_details.os, "replace", side_effect=locked_replace) as replace, \
+                mock.patch.object(get_details.time, "sleep") as sleep, \
+                self.assertLogs(get_details.logger, level="WARNING"):
+            written_file_name = get_details.replace_file(source, file_name)
+
+        self.assertEqual(sleep.call_count, len(get_details.REPLACE_RETRY_DELAYS))
+        self.assertEqual(replace.call_count, len(get_details.REPLACE_RETRY_DELAYS) + 1)
+        self.assertRegex(os.path.basename(written_file_name), r"^orders\.2025 \(\d{4}-\d{2}-\d{2} \d{2}-\d{2}-\d{2}\)\.csv$")
+        self.assertTrue(os.path.exists(written_file_name))
+        self.assertFalse(os.path.exists(source))
+        self.assertFalse(os.path.exists(file_name))
+
+if __name__ == '__main__':
+    unittest.main()
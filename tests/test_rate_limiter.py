@@ -0,0 +1,36 @@
+import threading
+import time
+import unittest
+
+from services.rate_limiter import RateLimiter
+
+class RateLimiterTest(unittest.TestCase):
+    def test_burst_then_throttle(self) -> None:
+        limiter = RateLimiter(max_rate=10)
+        start = time.monotonic()
+        for _ in range(15):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.45)
+
+    def test_pause_spreads_waiting_callers(self) -> None:
+        limiter = RateLimiter(max_rate=10)
+        limiter.pause(0.5)
+        start = time.monotonic()
+        released: list[float] = []
+
+        def worker() -> None:
+            limiter.acquire()
+            released.append(time.monotonic() - start)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        released.sort()
+        self.assertGreaterEqual(released[0], 0.5)
+        self.assertGreaterEqual(released[-1] - released[0], 0.4)
+
+if __name__ == '__main__':
+    unittest.main()